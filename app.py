@@ -1,14 +1,63 @@
 import streamlit as st
-from job_search_core import perform_search
-from job_analysis import analyze_job_for_sponsorship_and_keywords
+from job_search_core import get_full_description, perform_search
+from job_analysis import analyze_jobs_in_batches, job_id_from_url
+
+st.set_page_config(page_title="LinkedIn Job Sponsor AI", layout="wide")
 
 # Initialize session state keys
 if "filtered_jobs" not in st.session_state:
     st.session_state["filtered_jobs"] = []
 if "ai_results" not in st.session_state:
     st.session_state["ai_results"] = []
+if "analysis_by_job_id" not in st.session_state:
+    # LinkedIn job ID -> AI analysis, so no job is sent to the LLM twice in one session
+    # (a posting's jobUrl changes between searches; its ID does not)
+    st.session_state["analysis_by_job_id"] = {}
+
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def cached_search(**search_params):
+    """
+    Run perform_search once per distinct set of search filters (cached for 30 minutes).
+    Changing only the sponsorship option reuses the cached listings instead of scraping again;
+    descriptions are fetched outside this cache, by the sponsorship analysis.
+    """
+    return perform_search(**search_params)
+
+
+@st.fragment
+def render_job_card(index: int, job: dict) -> None:
+    """
+    Render one job result. As a fragment, clicking its "Show Full Job Details" button
+    reruns only this card instead of the whole page.
+    """
+    job_title = job.get("position", f"Job {index + 1}")
+    container_key = f"container_{index}_{job['jobUrl']}"
+    with st.container(key=container_key):
+        with st.expander(f"{index + 1}. {job_title} @ {job['company']}"):
+            st.markdown(f"**Location:** {job['location']}")
+            st.markdown(f"**Posted:** {job['agoTime']}")
+            st.markdown(f"**Visa Sponsorship Available?** {job['visa_sponsorship']}")
+            st.markdown(f"[🔗 View Job on LinkedIn]({job['jobUrl']})")
+            if job.get("ats_keywords"):
+                st.markdown("**Top ATS Keywords:**")
+                st.write("• " + "\n• ".join(job["ats_keywords"]))
+            preview = job.get("description_preview") or "No preview available."
+            st.markdown("**Job Preview:**")
+            st.markdown(preview)
+
+            # Use a session state flag to control full description display
+            flag_key = f"show_full_flag_{index}"
+            if st.button("Show Full Job Details", key=f"show_full_btn_{index}"):
+                st.session_state[flag_key] = True
+
+            if st.session_state.get(flag_key, False):
+                # Fetched on first click only; searches no longer download every description
+                full_description = get_full_description(job) or "Full description not available."
+                st.markdown("**Full Job Description:**")
+                st.markdown(full_description)
+
 
-st.set_page_config(page_title="LinkedIn Job Sponsor AI", layout="wide")
 st.title("🔍 LinkedIn Job Sponsor AI")
 
 # --- User Inputs ---
@@ -68,7 +117,7 @@ if st.button("🚀 Search Jobs"):
         st.warning("Please enter at least a Location.")
     else:
         with st.spinner("Fetching jobs from LinkedIn..."):
-            jobs = perform_search(
+            jobs = cached_search(
                 keyword=keyword,
                 location=location,
                 date_posted=date_posted,
@@ -88,41 +137,57 @@ if st.button("🚀 Search Jobs"):
             response_container = st.container()
             ai_results = []  # Local variable to store AI analysis for skipped jobs
 
-            for index, job in enumerate(jobs):
-                percent_complete = int((index + 1) / total_jobs * 100)
-                status_text.text(f"🔎 Analyzing job {index + 1} of {total_jobs} ({percent_complete}% complete)...")
+            if need_sponsorship == "Yes":
+                # Reuse analyses from earlier searches in this session
+                analysis_by_job_id = st.session_state["analysis_by_job_id"]
+                job_ids = [job_id_from_url(job["jobUrl"]) or job["jobUrl"] for job in jobs]
+                analyses = [analysis_by_job_id.get(job_id) for job_id in job_ids]
+                pending = [index for index, analysis in enumerate(analyses) if analysis is None]
+                completed = total_jobs - len(pending)
+
+                # Run AI analysis for the rest in batched requests; results arrive as each batch completes.
+                # All their descriptions start downloading at once, and each batch goes to the LLM as soon
+                # as its own descriptions are in, while later ones are still being fetched.
                 try:
-                    if need_sponsorship == "Yes":
-                        # Run AI analysis
-                        analysis = analyze_job_for_sponsorship_and_keywords(job)
-                        sponsorship_status = analysis["sponsorship_available"]
-                        keywords = analysis["ats_keywords"]
-
-                        # If sponsorship is not available, store AI analysis and skip this job
-                        if sponsorship_status != "yes":
-                            ai_results.append({
-                                "index": index + 1,
-                                "jobUrl": job["jobUrl"],
-                                "sponsorship": sponsorship_status,
-                                "ats_keywords": keywords
-                            })
-                            progress_bar.progress((index + 1) / total_jobs)
-                            continue
-
-                        # Add job to filtered list if it meets criteria
-                        job["visa_sponsorship"] = "✅ Yes"
-                        job["ats_keywords"] = keywords
-                        filtered_jobs.append(job)
-
-                    else:
-                        # When sponsorship is not required, skip AI analysis
-                        job["visa_sponsorship"] = "Not required"
-                        filtered_jobs.append(job)
-
-                    progress_bar.progress((index + 1) / total_jobs)
+                    for pending_index, analysis in analyze_jobs_in_batches(
+                        [jobs[index] for index in pending]
+                    ):
+                        index = pending[pending_index]
+                        analyses[index] = analysis
+                        analysis_by_job_id[job_ids[index]] = analysis
+                        completed += 1
+                        percent_complete = int(completed / total_jobs * 100)
+                        status_text.text(f"🔎 Analyzed job {completed} of {total_jobs} ({percent_complete}% complete)...")
+                        progress_bar.progress(completed / total_jobs)
                 except Exception as e:
                     st.error(f"Error during analysis: {e}")
-                    break
+
+                for index, (job, analysis) in enumerate(zip(jobs, analyses)):
+                    if analysis is None:
+                        continue
+                    sponsorship_status = analysis["sponsorship_available"]
+                    keywords = analysis["ats_keywords"]
+
+                    # If sponsorship is not available, store AI analysis and skip this job
+                    if sponsorship_status != "yes":
+                        ai_results.append({
+                            "index": index + 1,
+                            "jobUrl": job["jobUrl"],
+                            "sponsorship": sponsorship_status,
+                            "ats_keywords": keywords
+                        })
+                        continue
+
+                    # Add job to filtered list if it meets criteria
+                    job["visa_sponsorship"] = "✅ Yes"
+                    job["ats_keywords"] = keywords
+                    filtered_jobs.append(job)
+
+            else:
+                # When sponsorship is not required, skip AI analysis
+                for job in jobs:
+                    job["visa_sponsorship"] = "Not required"
+                    filtered_jobs.append(job)
 
             progress_bar.empty()
             status_text.text("✅ Finished analyzing jobs.")
@@ -135,30 +200,7 @@ if st.button("🚀 Search Jobs"):
 if st.session_state["filtered_jobs"]:
     st.success(f"Found {len(st.session_state['filtered_jobs'])} job(s):")
     for index, job in enumerate(st.session_state["filtered_jobs"]):
-        job_title = job.get("position", f"Job {index + 1}")
-        container_key = f"container_{index}_{job['jobUrl']}"
-        with st.container(key=container_key):
-            with st.expander(f"{index + 1}. {job_title} @ {job['company']}"):
-                st.markdown(f"**Location:** {job['location']}")
-                st.markdown(f"**Posted:** {job['agoTime']}")
-                st.markdown(f"**Visa Sponsorship Available?** {job['visa_sponsorship']}")
-                st.markdown(f"[🔗 View Job on LinkedIn]({job['jobUrl']})")
-                if job.get("ats_keywords"):
-                    st.markdown("**Top ATS Keywords:**")
-                    st.write("• " + "\n• ".join(job["ats_keywords"]))
-                preview = job.get("description_preview", "No preview available.")
-                st.markdown("**Job Preview:**")
-                st.markdown(preview)
-                
-                # Use a session state flag to control full description display
-                flag_key = f"show_full_flag_{index}"
-                if st.button("Show Full Job Details", key=f"show_full_btn_{index}"):
-                    st.session_state[flag_key] = True
-
-                if st.session_state.get(flag_key, False):
-                    full_description = job.get("full_description", "Full description not available.")
-                    st.markdown("**Full Job Description:**")
-                    st.markdown(full_description)
+        render_job_card(index, job)
 
 else:
     st.warning("No jobs found matching your criteria or sponsorship requirement.")
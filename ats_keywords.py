@@ -0,0 +1,188 @@
+import re
+import math
+import time
+import hashlib
+import functools
+import threading
+from collections import Counter
+from typing import List, Tuple
+from disk_cache import DESCRIPTION_KEY_PREFIX, cache
+
+# ATS keywords are the highest-scoring TF-IDF terms of each description, computed locally.
+# Tokens must start with a letter and may contain '+', '#', '.', '/' or '-', so skills such as
+# "c++", "c#", "node.js" and "ci/cd" survive tokenization.
+ATS_KEYWORD_COUNT = 10
+_KEYWORD_TOKEN_RE = re.compile(r"\b[^\W\d_](?:[\w.+#/-]*[\w+#])?")
+# Single letters are only kept when they name a language
+SINGLE_LETTER_SKILLS = frozenset({"c", "r"})
+# Two-word phrases never span a sentence, list item or clause: text is split on sentence
+# punctuation, commas, semicolons, bullets and line breaks (and on stop words) first
+_KEYWORD_SEGMENT_RE = re.compile(r"[.!?;:,]+(?=\s|$)|[\n\r\u2022\u00b7|()\[\]]+")
+# scikit-learn's English stop words, minus "go" (the language) and "system" (as in "system design")
+ENGLISH_STOP_WORDS = frozenset({
+    "a", "about", "above", "across", "after", "afterwards", "again", "against", "all", "almost",
+    "alone", "along", "already", "also", "although", "always", "am", "among", "amongst",
+    "amoungst", "amount", "an", "and", "another", "any", "anyhow", "anyone", "anything",
+    "anyway", "anywhere", "are", "around", "as", "at", "back", "be", "became", "because",
+    "become", "becomes", "becoming", "been", "before", "beforehand", "behind", "being", "below",
+    "beside", "besides", "between", "beyond", "bill", "both", "bottom", "but", "by", "call",
+    "can", "cannot", "cant", "co", "con", "could", "couldnt", "cry", "de", "describe", "detail",
+    "do", "done", "down", "due", "during", "each", "eg", "eight", "either", "eleven", "else",
+    "elsewhere", "empty", "enough", "etc", "even", "ever", "every", "everyone", "everything",
+    "everywhere", "except", "few", "fifteen", "fifty", "fill", "find", "fire", "first", "five",
+    "for", "former", "formerly", "forty", "found", "four", "from", "front", "full", "further",
+    "get", "give", "had", "has", "hasnt", "have", "he", "hence", "her", "here", "hereafter",
+    "hereby", "herein", "hereupon", "hers", "herself", "him", "himself", "his", "how",
+    "however", "hundred", "i", "ie", "if", "in", "inc", "indeed", "interest", "into", "is",
+    "it", "its", "itself", "keep", "last", "latter", "latterly", "least", "less", "ltd", "made",
+    "many", "may", "me", "meanwhile", "might", "mill", "mine", "more", "moreover", "most",
+    "mostly", "move", "much", "must", "my", "myself", "name", "namely", "neither", "never",
+    "nevertheless", "next", "nine", "no", "nobody", "none", "noone", "nor", "not", "nothing",
+    "now", "nowhere", "of", "off", "often", "on", "once", "one", "only", "onto", "or", "other",
+    "others", "otherwise", "our", "ours", "ourselves", "out", "over", "own", "part", "per",
+    "perhaps", "please", "put", "rather", "re", "same", "see", "seem", "seemed", "seeming",
+    "seems", "serious", "several", "she", "should", "show", "side", "since", "sincere", "six",
+    "sixty", "so", "some", "somehow", "someone", "something", "sometime", "sometimes",
+    "somewhere", "still", "such", "take", "ten", "than", "that", "the", "their", "them",
+    "themselves", "then", "thence", "there", "thereafter", "thereby", "therefore", "therein",
+    "thereupon", "these", "they", "thick", "thin", "third", "this", "those", "though", "three",
+    "through", "throughout", "thru", "thus", "to", "together", "too", "top", "toward",
+    "towards", "twelve", "twenty", "two", "un", "under", "until", "up", "upon", "us", "very",
+    "via", "was", "we", "well", "were", "what", "whatever", "when", "whence", "whenever",
+    "where", "whereafter", "whereas", "whereby", "wherein", "whereupon", "wherever", "whether",
+    "which", "while", "whither", "who", "whoever", "whole", "whom", "whose", "why", "will",
+    "with", "within", "without", "would", "yet", "you", "your", "yours", "yourself",
+    "yourselves",
+})
+# Job-posting boilerplate that is frequent in every description but names no skill
+JOB_POSTING_STOP_WORDS = frozenset({
+    "ability", "able", "applicant", "applicants", "apply", "availability", "available", "benefit",
+    "benefits", "bonus", "build", "building", "candidate", "candidates", "company", "compensation",
+    "culture", "day", "days", "dental", "employer", "employment", "environment", "equal", "equity",
+    "excellent", "experience", "experiences", "familiarity", "great", "h-1b", "h1b", "health",
+    "help", "hours", "include", "including", "insurance", "job", "jobs", "join", "knowledge",
+    "location", "looking", "mission", "need", "needs", "new", "offer", "offers", "office",
+    "opportunities", "opportunity", "paid", "people", "plus", "position", "preferred", "pto",
+    "qualification", "qualifications", "related", "relevant", "remote", "require", "required",
+    "requirement", "requirements", "requires", "responsibilities", "responsibility", "role",
+    "roles", "salary", "skill", "skills", "sponsor", "sponsored", "sponsoring", "sponsors",
+    "sponsorship", "strong", "team", "teams", "time", "understanding", "unlimited", "use", "using",
+    "visa", "visas", "vision", "week", "work", "working", "works", "world", "year", "years",
+})
+# Document frequencies come from up to this many cached descriptions (recomputed hourly),
+# so terms common to most postings rank low even when a single description is analyzed
+ATS_IDF_CORPUS_SIZE = 500
+ATS_IDF_REFRESH_SECONDS = 60 * 60
+_corpus_lock = threading.Lock()
+
+
+def extract_ats_keywords(descriptions: List[str]) -> List[List[str]]:
+    """
+    Top ATS keywords (single words and two-word phrases) for each description, ranked by TF-IDF.
+    Inverse document frequencies are taken over the cached descriptions plus those given ones the
+    corpus does not already hold (each description counts once), and job-posting boilerplate
+    ("experience", "team", "benefits", ...) is never a keyword.
+    Two-word phrases must recur, in the description or across postings. A phrase wins over its
+    own words when it scores as high (replacing a word already chosen), and words or phrases
+    overlapping a chosen phrase are skipped.
+    Returns one keyword list per description, in input order.
+    """
+    term_lists = [_keyword_terms(description) for description in descriptions]
+    with _corpus_lock:
+        # One thread rebuilds the counts after each refresh; the others wait and reuse them
+        corpus_frequencies, corpus_digests = _keyword_document_frequencies(
+            int(time.time() // ATS_IDF_REFRESH_SECONDS)
+        )
+    # Fetched descriptions are cached before they are analyzed, so most are already in the corpus
+    new_terms = {
+        digest: terms for digest, terms in zip(map(_description_digest, descriptions), term_lists)
+        if digest not in corpus_digests
+    }
+    group_frequencies = Counter(term for terms in new_terms.values() for term in set(terms))
+    document_count = len(corpus_digests) + len(new_terms)
+
+    keywords = []
+    for terms in term_lists:
+        scores = {
+            term: count * (
+                math.log((1 + document_count) / (1 + corpus_frequencies[term] + group_frequencies[term])) + 1
+            )
+            for term, count in Counter(terms).items()
+            # A phrase seen once, in one posting, is usually just two neighbouring words
+            if " " not in term or count > 1 or corpus_frequencies[term] + group_frequencies[term] > 1
+        }
+        chosen: List[str] = []
+        chosen_words = set()
+        phrase_words = set()
+        # Ties go to the phrase: it can only score as high as its words when it accounts for
+        # every occurrence of them
+        for term in sorted(scores, key=lambda term: (scores[term], " " in term), reverse=True):
+            words = term.split()
+            if phrase_words.intersection(words):
+                continue
+            if len(words) == 1:
+                chosen.append(term)
+            elif chosen_words.issuperset(words):
+                continue
+            else:
+                replaced = [index for index, keyword in enumerate(chosen) if keyword in words]
+                if replaced:
+                    chosen[replaced[0]] = term
+                else:
+                    chosen.append(term)
+                phrase_words.update(words)
+            chosen_words.update(words)
+            if len(chosen) == ATS_KEYWORD_COUNT:
+                break
+        keywords.append(chosen)
+    return keywords
+
+
+_KEYWORD_STOP_WORDS = ENGLISH_STOP_WORDS | JOB_POSTING_STOP_WORDS
+
+
+def _keyword_terms(description: str) -> List[str]:
+    """
+    Every keyword candidate in a description (with repeats): each non-stop-word token, and each
+    pair of adjacent tokens within the same clause with no stop word between them.
+    """
+    terms = []
+    for segment in _KEYWORD_SEGMENT_RE.split(description.lower()):
+        previous = None
+        for token in _KEYWORD_TOKEN_RE.findall(segment):
+            if token in _KEYWORD_STOP_WORDS or (len(token) == 1 and token not in SINGLE_LETTER_SKILLS):
+                previous = None
+                continue
+            terms.append(token)
+            if previous:
+                terms.append(f"{previous} {token}")
+            previous = token
+    return terms
+
+
+def _description_digest(description: str) -> bytes:
+    return hashlib.sha256(description.encode("utf-8")).digest()
+
+
+@functools.lru_cache(maxsize=1)
+def _keyword_document_frequencies(refresh_period: int) -> Tuple[Counter, frozenset]:
+    """
+    Document frequency of every keyword term over up to ATS_IDF_CORPUS_SIZE distinct cached
+    descriptions, and the digests of the descriptions counted. `refresh_period` only serves as
+    the cache key, so the counts are rebuilt once per ATS_IDF_REFRESH_SECONDS.
+    """
+    frequencies: Counter = Counter()
+    digests = set()
+    for key in cache.iterkeys():
+        if len(digests) >= ATS_IDF_CORPUS_SIZE:
+            break
+        if not key.startswith(DESCRIPTION_KEY_PREFIX):
+            continue
+        description = cache.get(key)
+        if not description:
+            continue
+        digest = _description_digest(description)
+        if digest not in digests:
+            frequencies.update(set(_keyword_terms(description)))
+            digests.add(digest)
+    return frequencies, frozenset(digests)
@@ -0,0 +1,8 @@
+from diskcache import Cache
+
+# On-disk cache shared by the analysis modules: fetched descriptions (keyed by LinkedIn job ID
+# under DESCRIPTION_KEY_PREFIX), AI verdicts and LLM responses (keyed by hashes of their input)
+CACHE_DIR = "./.cache"
+CACHE_EXPIRE_SECONDS = 24 * 60 * 60
+DESCRIPTION_KEY_PREFIX = "description:"
+cache = Cache(CACHE_DIR)
@@ -1,18 +1,179 @@
 import os
-import time
-import random
+import re
+import orjson
+import hashlib
+import logging
+import functools
+import threading
 import requests
-from bs4 import BeautifulSoup
-from typing import TypedDict, Optional
-from langchain_openai import ChatOpenAI
+from selectolax.lexbor import LexborHTMLParser
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, List, Optional, Tuple, TypedDict
 from langchain.prompts import PromptTemplate
 from langchain.schema import HumanMessage
-from job_search_core import JobListing
+from job_search_core import JobListing, store_full_description
+from rate_limiter import TokenBucket
+from http_client import create_session
+from ats_keywords import extract_ats_keywords
+from disk_cache import CACHE_EXPIRE_SECONDS, DESCRIPTION_KEY_PREFIX, cache
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+logger = logging.getLogger(__name__)
+
+DETAIL_HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": "https://www.linkedin.com/jobs",
+}
+
+# Global politeness limit (10 requests per 5 seconds) shared by every worker thread
+description_rate_limiter = TokenBucket(max_rate=10, time_period=5)
+
+
+# Clients are created once per process on first use and then shared by every caller,
+# including every Streamlit rerun, so connection pools and TLS sessions are reused.
+@functools.lru_cache(maxsize=None)
+def get_http_session() -> requests.Session:
+    # Not an HTTP-cached session: descriptions are cached by job ID in the diskcache instead,
+    # so storing every full detail page as well would only duplicate them
+    return create_session(DETAIL_HEADERS, pool_maxsize=DESCRIPTION_FETCH_WORKERS + MAX_CONCURRENT_ANALYSES)
+
+
+# gpt-4o-mini answers a short classification prompt faster and far cheaper than gpt-3.5-turbo.
+# Output is capped per call type so the model cannot ramble: a yes/no verdict needs a token or two.
+LLM_MODEL = "gpt-4o-mini"
+SPONSORSHIP_MAX_TOKENS = 64
+BATCH_MAX_TOKENS = 512
+
+
+# The OpenAI client (and its import) is only paid for once a description actually needs the model,
+# not on import, when sponsorship analysis is off, or when the cache/prefilter already answered.
+@functools.lru_cache(maxsize=None)
+def get_llm() -> "ChatOpenAI":
+    from langchain_openai import ChatOpenAI
+
+    # Initialize OpenAI LLM with your API key
+    return ChatOpenAI(
+        model=LLM_MODEL,
+        temperature=0,
+        max_tokens=SPONSORSHIP_MAX_TOKENS,
+        timeout=15,
+        max_retries=2,
+        api_key=os.getenv("OPENAI_API_KEY"),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_batch_llm() -> "ChatOpenAI":
+    from langchain_openai import ChatOpenAI
+
+    # Same model in JSON mode, used when several jobs are analyzed in one request
+    return ChatOpenAI(
+        model=LLM_MODEL,
+        temperature=0,
+        max_tokens=BATCH_MAX_TOKENS,
+        timeout=60,
+        max_retries=2,
+        api_key=os.getenv("OPENAI_API_KEY"),
+        model_kwargs={"response_format": {"type": "json_object"}},
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _yes_no_logit_bias() -> dict:
+    """
+    Logit bias nudging the sponsorship answer towards the single tokens 'yes' / 'no'.
+    Returns an empty dict if the tokenizer is unavailable (e.g. offline without cached encodings).
+    """
+    try:
+        import tiktoken
+
+        try:
+            encoding = tiktoken.encoding_for_model(LLM_MODEL)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+        token_ids = set()
+        for word in ("yes", "no", "Yes", "No"):
+            tokens = encoding.encode(word)
+            if len(tokens) == 1:
+                token_ids.add(tokens[0])
+    except Exception as e:
+        logger.debug("Logit bias disabled, tokenizer unavailable: %s", e)
+        return {}
+    return {str(token_id): 5 for token_id in token_ids}
+
+
+# Optional local sponsorship classifier: a small fine-tuned model (e.g. MiniLM/DistilBERT) exported
+# to ONNX with optimum and INT8-quantized. Confident predictions skip the API call entirely;
+# probabilities inside LOCAL_CLASSIFIER_UNCERTAIN still go to the LLM.
+SPONSORSHIP_CLASSIFIER_PATH = os.getenv("SPONSORSHIP_CLASSIFIER_PATH", "")
+LOCAL_CLASSIFIER_UNCERTAIN = (0.4, 0.6)
+_POSITIVE_LABELS = {"yes", "label_1", "1", "sponsorship"}
+
+
+@functools.lru_cache(maxsize=None)
+def get_local_classifier():
+    """
+    Load the ONNX classifier from SPONSORSHIP_CLASSIFIER_PATH as a transformers pipeline.
+    Returns None when no path is configured, optimum/transformers are not installed or the model
+    cannot be loaded (the failure is logged once; the result, including None, is cached).
+    """
+    if not SPONSORSHIP_CLASSIFIER_PATH:
+        return None
+    try:
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+        from transformers import AutoTokenizer, pipeline
+    except ImportError as e:
+        logger.warning("Local sponsorship classifier disabled, missing dependency: %s", e)
+        return None
+
+    try:
+        model = ORTModelForSequenceClassification.from_pretrained(SPONSORSHIP_CLASSIFIER_PATH)
+        tokenizer = AutoTokenizer.from_pretrained(SPONSORSHIP_CLASSIFIER_PATH)
+        return pipeline(
+            "text-classification", model=model, tokenizer=tokenizer, top_k=None, truncation=True, max_length=512
+        )
+    except Exception as e:
+        logger.warning(
+            "Local sponsorship classifier disabled, could not load %s: %s", SPONSORSHIP_CLASSIFIER_PATH, e
+        )
+        return None
+
+
+def local_sponsorship_probability(description: str) -> Optional[float]:
+    """
+    Probability that the description offers sponsorship according to the local classifier,
+    or None when no local classifier is configured, inference fails or the model's labels are not
+    recognised (the LLM decides then).
+    """
+    classifier = get_local_classifier()
+    if classifier is None:
+        return None
+
+    try:
+        scores = classifier(truncate_description(description))
+    except Exception as e:
+        logger.warning("Local sponsorship classifier failed, falling back to the LLM: %s", e)
+        return None
+    if scores and isinstance(scores[0], list):
+        scores = scores[0]
+    positive_scores = [score["score"] for score in scores if score["label"].lower() in _POSITIVE_LABELS]
+    if not positive_scores:
+        _warn_unrecognised_labels(frozenset(score["label"] for score in scores))
+        return None
+    return sum(positive_scores)
+
+
+@functools.lru_cache(maxsize=None)
+def _warn_unrecognised_labels(labels: frozenset) -> None:
+    # Cached, so each set of unknown labels is reported once rather than once per job
+    logger.warning(
+        "Ignoring the local sponsorship classifier, none of its labels %s is a positive label (%s)",
+        sorted(labels), ", ".join(sorted(_POSITIVE_LABELS)),
+    )
 
-# Initialize OpenAI LLM with your API key
-llm = ChatOpenAI(
-    model="gpt-3.5-turbo", temperature=0, api_key=os.getenv("OPENAI_API_KEY")
-)
 
 prompt = PromptTemplate(
     input_variables=["description"],
@@ -24,110 +185,567 @@ prompt = PromptTemplate(
     ),
 )
 
-ats_prompt = PromptTemplate(
-    input_variables=["description"],
+batch_prompt = PromptTemplate(
+    input_variables=["jobs"],
     template=(
-        "Analyze the following job description and extract the top 10 keywords or phrases that an Applicant Tracking System (ATS) might prioritize.\n\n"
-        "Focus on technical skills, certifications, tools, and job-relevant terminology.\n\n"
-        "Job Description:\n{description}\n\n"
-        "Top 10 ATS Keywords:"
-    )
+        "Carefully read each job in the JSON array below; every job has an \"id\" and a \"description\". For every job, "
+        "decide whether the company explicitly states they offer visa sponsorship. Answer 'yes' only if it is "
+        "explicitly offered; if sponsorship is not mentioned or explicitly denied, answer 'no'.\n\n"
+        "Respond with a JSON object containing one entry per job, in the form:\n"
+        '{{"results": [{{"id": <job id>, "sponsorship": "yes" or "no"}}]}}\n\n'
+        "Jobs:\n{jobs}"
+    ),
+)
+
+
+def _split_template(template: PromptTemplate, variable: str) -> Tuple[str, str]:
+    """
+    Render a single-variable template once around a marker and return the static text before
+    and after the variable, so prompts can be built by plain string concatenation per call.
+    """
+    marker = "\x00"
+    prefix, suffix = template.format(**{variable: marker}).split(marker)
+    return prefix, suffix
+
+
+_SPONSOR_PREFIX, _SPONSOR_SUFFIX = _split_template(prompt, "description")
+_BATCH_PREFIX, _BATCH_SUFFIX = _split_template(batch_prompt, "jobs")
+
+# Jobs analyzed side by side; fetches and LLM calls are network-bound, so this mostly bounds
+# how many requests are in flight against LinkedIn and OpenAI at once.
+MAX_CONCURRENT_ANALYSES = 8
+# Every LLM request, from any pool (including the per-job fallbacks that batches start on their
+# own threads), holds one of these slots, so at most MAX_CONCURRENT_ANALYSES reach OpenAI at once
+_llm_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_ANALYSES)
+
+# Background pool that fetches descriptions concurrently (for search results, and ahead of
+# the LLM analysis that needs them); politeness is enforced by description_rate_limiter
+DESCRIPTION_FETCH_WORKERS = 6
+_description_fetcher = ThreadPoolExecutor(
+    max_workers=DESCRIPTION_FETCH_WORKERS, thread_name_prefix="description-fetch"
 )
 
+# Jobs packed into a single LLM request by analyze_jobs_batch
+ANALYSIS_BATCH_SIZE = 8
+
+# Description budget for the sponsorship prompts. Visa language sits near the top of a posting
+# or in the legal/benefits section at the end, so longer descriptions keep their head and tail.
+MAX_DESC_CHARS = 3000
+DESC_HEAD_CHARS = 2000
+DESC_TAIL_CHARS = MAX_DESC_CHARS - DESC_HEAD_CHARS
+
+# Sponsorship phrases checked before asking the model. A description with a negative phrase, no
+# un-negated positive one and no other un-negated mention of "sponsor" is decided 'no' locally;
+# everything else goes to the model.
+# Only a 'no' is ever decided this way: a positive phrase can still be negated in ways a regex
+# misses, and a wrong 'yes' is the costly mistake, so positive matches always go to the model.
+_NO_SPONSOR_RE = re.compile(
+    r"\b(will not sponsor|won't sponsor|does not sponsor|no (visa )?sponsorship|no h-?1b"
+    r"|must be (authorized|eligible) to work\b[^.]{0,40}?\bwithout (visa )?sponsorship"
+    r"|(will not|won't|do not|does not|cannot|can't|unable to|no longer) (sponsor|offer|provide|support)\b[^.]{0,40}?\b(sponsorship|h-?1b|visas?)\b"
+    r"|sponsorship[^.]{0,40}?\bwill not be considered"
+    r"|h-?1b transfers? (is |are )?not (supported|available|offered))",
+    re.I,
+)
+_YES_SPONSOR_RE = re.compile(
+    r"\b(visa sponsorship (is )?(available|offered|provided)|will sponsor|h-?1b (transfer|sponsorship))",
+    re.I,
+)
+_SPONSOR_WORD_RE = re.compile(r"\bsponsor", re.I)
+# Negation before a positive phrase (in the same clause) means the phrase does not offer anything.
+# Clauses end at sentence punctuation, commas, semicolons, colons and contrasting conjunctions,
+# so "we do not sponsor TN visas, but we will sponsor green cards" still reads as an offer.
+_NEGATION_RE = re.compile(r"\b(not|unable|cannot|can't|won't|no longer)\b", re.I)
+# After the phrase only a negation governing it counts ("sponsorship is not available"), not a
+# later one about something else ("H-1B transfers for candidates not requiring relocation")
+_NEGATION_AFTER_RE = re.compile(
+    r"\w*\s*((is|are|was|will|can|does|do)\s+)?(not|no longer|cannot|can't|won't|isn't|aren't)\b", re.I
+)
+_CLAUSE_BOUNDARY_RE = re.compile(r"[.!?;:,]|\b(but|however|although|though)\b", re.I)
+SPONSOR_NEGATION_WINDOW = 40
+
+# Anything that could bear on sponsorship at all. The prompt answers 'no' when sponsorship is
+# not mentioned, so a description matching none of these terms is 'no' without asking the model.
+SPONSORSHIP_SCREEN_TERMS = [
+    r"sponsor",
+    r"visa",
+    r"h-?1b",
+    r"green card",
+    r"immigration",
+    r"work authori[sz]ation",
+    r"(authorized|eligible|right) to work",
+    r"work permit",
+    r"citizen",
+    r"\bopt\b",
+    r"\bcpt\b",
+    r"\bead\b",
+]
+_SPONSORSHIP_MENTION_RE = re.compile("|".join(SPONSORSHIP_SCREEN_TERMS), re.I)
+
+# Element holding the description on a job detail page, and the tag that opens it
+DESCRIPTION_SELECTOR = "div.show-more-less-html__markup"
+_DESCRIPTION_START_RE = re.compile(r"<div\b[^>]*\bshow-more-less-html__markup\b")
+
+# Numeric job ID at the end of a LinkedIn job URL path, e.g. /jobs/view/software-engineer-at-acme-3912345678?refId=...
+_JOB_ID_RE = re.compile(r"[/-](\d+)/?(?:[?#]|$)")
+
+
+def job_id_from_url(job_url: str) -> Optional[str]:
+    """
+    LinkedIn's numeric job ID from a job URL, or None when the URL carries none. The same posting
+    is linked with different refId/trackingId/position query strings, so the ID is the stable key.
+    """
+    match = _JOB_ID_RE.search(job_url)
+    return match.group(1) if match else None
+
+
 # Define the structure for the agent state
 class JobState(TypedDict):
     description: str
     sponsorship_available: str  # explicitly "yes" or "no"
 
 
+def truncate_description(description: str) -> str:
+    """
+    Shorten a description to roughly MAX_DESC_CHARS by keeping its first and last parts.
+    """
+    if len(description) <= MAX_DESC_CHARS:
+        return description
+    return f"{description[:DESC_HEAD_CHARS]}\n...\n{description[-DESC_TAIL_CHARS:]}"
+
+
+def _analysis_cache_key(description: str) -> str:
+    # v5: verdicts cached before the prefilter stopped reading any later "not" in a clause as
+    # negating an offer are not reused
+    return "analysis:v5:" + hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+
+def _get_cached_analysis(description: str) -> dict:
+    """
+    Return whatever has already been cached for this description: any of
+    'sponsorship_available' and 'ats_keywords' (empty dict on a miss).
+    """
+    cached = cache.get(_analysis_cache_key(description))
+    return orjson.loads(cached) if cached else {}
+
+
+def _store_analysis(description: str, analysis: dict) -> None:
+    """
+    Merge analysis results into the cached JSON value for this description.
+    """
+    merged = {**_get_cached_analysis(description), **analysis}
+    cache.set(_analysis_cache_key(description), orjson.dumps(merged), expire=CACHE_EXPIRE_SECONDS)
+
+
+def invoke_cached(
+    llm: "ChatOpenAI", prompt_text: str, validate: Optional[Callable[[str], bool]] = None, **kwargs
+) -> str:
+    """
+    Send a single-message prompt to the LLM and return the response text, serving exact repeats
+    (same model settings, call options and prompt text) from the on-disk cache.
+    With `validate`, only responses it accepts are cached (or served from the cache), so a
+    malformed reply is asked for again next time instead of being replayed until it expires.
+    """
+    key_material = orjson.dumps(
+        [llm.model_name, llm.max_tokens, llm.model_kwargs, kwargs, prompt_text],
+        option=orjson.OPT_SORT_KEYS,
+    )
+    cache_key = "prompt:" + hashlib.sha256(key_material).hexdigest()
+    cached_response = cache.get(cache_key)
+    if cached_response is not None and (validate is None or validate(cached_response)):
+        return cached_response
+
+    with _llm_request_slots:
+        response = llm.invoke([HumanMessage(content=prompt_text)], **kwargs).content
+    if validate is None or validate(response):
+        cache.set(cache_key, response, expire=CACHE_EXPIRE_SECONDS)
+    return response
+
+
 def fetch_full_job_description(job_url: str) -> Optional[str]:
     """
     Fetch the complete job description from LinkedIn using their guest-access API endpoint.
     Includes debug statements for clear visibility into fetched descriptions.
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Referer": "https://www.linkedin.com/jobs",
-    }
-
-    # Extract the job ID explicitly from URL
-    try:
-        job_id = job_url.split("/")[-1].split("?")[0].split("-")[-1]
-        detail_url = f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
-    except Exception as e:
-        print(f"[Debug] Invalid URL format for {job_url}: {e}")
+    job_id = job_id_from_url(job_url)
+    if not job_id:
+        logger.debug("Invalid URL format for %s: no job ID found", job_url)
         return None
 
+    cache_key = f"{DESCRIPTION_KEY_PREFIX}{job_id}"
+    cached_description = cache.get(cache_key)
+    if cached_description:
+        return cached_description
+
+    detail_url = f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
+
     try:
-        response = requests.get(detail_url, headers=headers)
+        with description_rate_limiter:
+            response = get_http_session().get(detail_url, timeout=10)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        description_section = soup.find("div", class_="show-more-less-html__markup")
+        # Only the page from the description block onwards is parsed; the <head> and top-card markup
+        # before it are skipped without building a tree for them.
+        html = response.text
+        start = _DESCRIPTION_START_RE.search(html)
+        description_section = (
+            LexborHTMLParser(html[start.start():]).css_first(DESCRIPTION_SELECTOR) if start else None
+        )
 
         if description_section:
-            description_text = description_section.get_text(separator="\n").strip()
+            description_text = description_section.text(separator="\n").strip()
 
-            # Debug output explicitly showing fetched description snippet
-            print(
-                f"[Debug] Successfully fetched description for URL ({detail_url}):\n"
-                f"{'-'*60}\n"
-                f"{description_text[:500]}...\n"  # Display first 500 chars explicitly
-                f"{'-'*60}\n"
-            )
+            # Debug output showing the first 500 chars of the fetched description
+            # (the snippet is only sliced when debug logging is actually enabled)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Successfully fetched description for URL (%s):\n%s\n%s...\n%s",
+                    detail_url, "-" * 60, description_text[:500], "-" * 60,
+                )
 
+            cache.set(cache_key, description_text, expire=CACHE_EXPIRE_SECONDS)
             return description_text
         else:
-            print(f"[Debug] No description found at {detail_url}")
+            logger.debug("No description found at %s", detail_url)
             return None
     except Exception as e:
-        print(f"[Debug] Error fetching description from {detail_url}: {e}")
+        logger.warning("Error fetching description from %s: %s", detail_url, e)
         return None
-    finally:
-        # Polite and clearly random delay to avoid blocking
-        time.sleep(random.uniform(3, 5))
 
 
 def sponsorship_detection_node(state: JobState):
     """
     LangChain node clearly analyzing if visa sponsorship is explicitly offered or not.
+    Verdicts are cached by description hash, so a repeated description skips the API call.
     """
+    cached = _get_cached_analysis(state["description"])
+    if "sponsorship_available" in cached:
+        return {"sponsorship_available": cached["sponsorship_available"]}
 
-    message = HumanMessage(content=prompt.format(description=state["description"]))
-    response = llm.invoke([message]).content.strip().lower()
+    # Build the prompt from the precomputed template parts and reuse the text for the debug output
+    prompt_text = f"{_SPONSOR_PREFIX}{truncate_description(state['description'])}{_SPONSOR_SUFFIX}"
+    response = invoke_cached(get_llm(), prompt_text, logit_bias=_yes_no_logit_bias()).strip().lower()
 
-    print(
-        "AI Prompt:\n", prompt.format(description=state["description"])[:500], "..."
-    )  # Debug
-    print("AI Response:", response)  # Debug
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("AI Prompt:\n%s ...", prompt_text[:500])
+    logger.debug("AI Response: %s", response)
 
     # Clearly ensure the response is strictly 'yes' or 'no'
     sponsorship_available = "yes" if "yes" in response else "no"
+    _store_analysis(state["description"], {"sponsorship_available": sponsorship_available})
     return {"sponsorship_available": sponsorship_available}
 
 
+def prefilter_sponsorship(description: str) -> Optional[str]:
+    """
+    Decide obvious refusals with regular expressions before any LLM call.
+    Returns 'no' when the description clearly denies sponsorship (and offers it nowhere) or never
+    touches on sponsorship or work authorization at all, otherwise None. Never returns 'yes'.
+
+    >>> prefilter_sponsorship("We are unable to offer H-1B sponsorship for this role.")
+    'no'
+    >>> prefilter_sponsorship("We do not provide H1B sponsorship.")
+    'no'
+    >>> prefilter_sponsorship("Candidates requiring H-1B sponsorship will not be considered.")
+    'no'
+    >>> prefilter_sponsorship("H-1B transfer not supported")
+    'no'
+    >>> prefilter_sponsorship("Must be authorized to work in the US without sponsorship.")
+    'no'
+    >>> prefilter_sponsorship("Visa sponsorship is available for this role.") is None
+    True
+    >>> prefilter_sponsorship(
+    ...     "Sponsorship available for the right candidate. Must be authorized to work in the US."
+    ... ) is None
+    True
+    >>> prefilter_sponsorship(
+    ...     "Candidates must be eligible to work in the US; we are happy to sponsor visas for top candidates."
+    ... ) is None
+    True
+    >>> prefilter_sponsorship("We will sponsor H-1B visas, but cannot sponsor contractors.") is None
+    True
+    >>> prefilter_sponsorship("We do not sponsor TN visas, but we will sponsor green cards.") is None
+    True
+    >>> prefilter_sponsorship(
+    ...     "We will not sponsor H-1B visas, but green card sponsorship is available after one year."
+    ... ) is None
+    True
+    >>> prefilter_sponsorship(
+    ...     "We will not sponsor candidates on OPT. "
+    ...     "We can sponsor H-1B transfers for candidates not requiring relocation."
+    ... ) is None
+    True
+    >>> prefilter_sponsorship(
+    ...     "We do not sponsor TN visas. H-1B sponsorship is provided for roles not based in Canada."
+    ... ) is None
+    True
+    >>> prefilter_sponsorship("We do not sponsor visas. Sponsorship is not available for this role.")
+    'no'
+    """
+    if not _SPONSORSHIP_MENTION_RE.search(description):
+        return "no"
+
+    refusals = [match.span() for match in _NO_SPONSOR_RE.finditer(description)]
+    if not refusals:
+        return None
+    if any(not _is_negated(description, match) for match in _YES_SPONSOR_RE.finditer(description)):
+        return None
+    # Any other mention of sponsoring that is not itself negated may be an offer the phrases miss
+    for match in _SPONSOR_WORD_RE.finditer(description):
+        inside_refusal = any(start <= match.start() < end for start, end in refusals)
+        if not inside_refusal and not _is_negated(description, match):
+            return None
+    return "no"
+
+
+def _is_negated(description: str, match: "re.Match") -> bool:
+    """
+    Whether a negation appears within SPONSOR_NEGATION_WINDOW characters before the match
+    (without crossing a clause boundary) or directly after it.
+    """
+    before = description[max(0, match.start() - SPONSOR_NEGATION_WINDOW):match.start()]
+    clause_start = max((boundary.end() for boundary in _CLAUSE_BOUNDARY_RE.finditer(before)), default=0)
+    before = before[clause_start:]
+    after = description[match.end():match.end() + SPONSOR_NEGATION_WINDOW]
+    boundary = _CLAUSE_BOUNDARY_RE.search(after)
+    if boundary:
+        after = after[:boundary.start()]
+    return _NEGATION_RE.search(before) is not None or _NEGATION_AFTER_RE.match(after) is not None or (
+        "will not be considered" in after.lower()
+    )
+
+
+def _local_sponsorship_verdict(description: str) -> Optional[str]:
+    """
+    Verdict that needs no API call: the regex prefilter, then the local classifier (if configured)
+    when it is confident. Returns None when both are inconclusive.
+    """
+    verdict = prefilter_sponsorship(description)
+    if verdict:
+        return verdict
+
+    probability = local_sponsorship_probability(description)
+    if probability is not None:
+        low, high = LOCAL_CLASSIFIER_UNCERTAIN
+        if probability > high:
+            return "yes"
+        if probability < low:
+            return "no"
+    return None
+
+
+def _detect_sponsorship(description: str) -> str:
+    """
+    Sponsorship verdict for a description: local checks first, the LLM node only when they are inconclusive.
+    """
+    verdict = _local_sponsorship_verdict(description)
+    if verdict:
+        return verdict
+
+    state = JobState(description=description, sponsorship_available="no")
+    return sponsorship_detection_node(state)["sponsorship_available"]
+
+
+def analyze_job_for_sponsorship(job: JobListing) -> str:
+    """
+    Runs only the visa sponsorship check on a job description.
+    Returns 'yes' or 'no'.
+    """
+    description = fetch_full_job_description(job["jobUrl"])
+    if not description:
+        return "no"
+
+    return _detect_sponsorship(description)
+
+
 def analyze_job_for_sponsorship_and_keywords(job: JobListing) -> dict:
     """
     Runs both visa sponsorship detection and ATS keyword extraction on a job description.
     Returns a dictionary with 'sponsorship_available' and 'ats_keywords'.
+    Cheapest answers first: cached description and verdicts, then the regex prefilter,
+    and only then the LLM (which is created on first use).
     """
     description = fetch_full_job_description(job['jobUrl'])
     if not description:
         return {"sponsorship_available": "no", "ats_keywords": []}
 
-    # --- Run visa sponsorship check ---
-    sponsor_msg = HumanMessage(content=prompt.format(description=description))
-    sponsorship_response = llm.invoke([sponsor_msg]).content.strip().lower()
-    sponsorship_status = "yes" if "yes" in sponsorship_response else "no"
+    return _analyze_description(description)
 
-    # --- Run ATS keyword extraction ---
-    ats_msg = HumanMessage(content=ats_prompt.format(description=description))
-    ats_response = llm.invoke([ats_msg]).content.strip()
-    ats_keywords = [kw.strip("-• ").strip() for kw in ats_response.split("\n") if kw.strip()]
 
-    return {
-        "sponsorship_available": sponsorship_status,
-        "ats_keywords": ats_keywords
+def _analyze_description(description: str) -> dict:
+    """
+    Runs sponsorship detection and ATS keyword extraction on an already fetched description,
+    skipping whichever results are already cached.
+    """
+    cached = _get_cached_analysis(description)
+    if "sponsorship_available" in cached and "ats_keywords" in cached:
+        return cached
+
+    analysis = {
+        "sponsorship_available": _detect_sponsorship(description),
+        "ats_keywords": cached.get("ats_keywords") or extract_ats_keywords([description])[0],
     }
+    _store_analysis(description, analysis)
+    return analysis
+
+
+def prefetch_descriptions(jobs: List[JobListing]) -> List[Future]:
+    """
+    Start fetching every job's description on the background pool.
+    Jobs whose description was already fetched (e.g. by get_full_description) are not fetched again.
+    Returns one Future per job, in input order.
+    """
+    futures = []
+    for job in jobs:
+        if job.get("full_description") is not None:
+            future: Future = Future()
+            future.set_result(job["full_description"] or None)
+        else:
+            future = _description_fetcher.submit(fetch_full_job_description, job["jobUrl"])
+        futures.append(future)
+    return futures
+
+
+def _parse_batch_response(response: str) -> Optional[list]:
+    """
+    The "results" list of a batch analysis response, or None when the response is not that JSON.
+    """
+    try:
+        entries = orjson.loads(response)["results"]
+    except (ValueError, KeyError, TypeError):
+        return None
+    return entries if isinstance(entries, list) else None
+
+
+def analyze_jobs_batch(
+    jobs: List[JobListing], descriptions: Optional[List[Optional[str]]] = None
+) -> List[dict]:
+    """
+    Analyzes several jobs with at most one LLM request instead of one request per job.
+    Returns one {'sponsorship_available', 'ats_keywords'} dictionary per job, in input order.
+    ATS keywords are extracted locally for the whole group at once, and only jobs whose sponsorship
+    the local checks cannot settle are sent to the model. Jobs missing from the model's answer
+    fall back to the per-job prompt (run concurrently).
+    Already fetched descriptions can be passed in; otherwise they are fetched here.
+    """
+    if descriptions is None:
+        descriptions = [fetch_full_job_description(job["jobUrl"]) for job in jobs]
+    results: List[Optional[dict]] = []
+    cached_analyses: List[dict] = []
+    for description in descriptions:
+        cached = _get_cached_analysis(description) if description else {}
+        cached_analyses.append(cached)
+        if not description:
+            results.append({"sponsorship_available": "no", "ats_keywords": []})
+        # Only jobs without a complete cached verdict are analyzed
+        elif "sponsorship_available" in cached and "ats_keywords" in cached:
+            results.append(cached)
+        else:
+            results.append(None)
 
+    pending = [index for index, result in enumerate(results) if result is None]
+    keywords = dict(zip(pending, extract_ats_keywords([descriptions[index] for index in pending])))
+    verdicts = {
+        index: cached_analyses[index].get("sponsorship_available") or _local_sponsorship_verdict(descriptions[index])
+        for index in pending
+    }
+
+    # Jobs go in as a JSON array, so description text can never be mistaken for a job boundary
+    ask_model = [index for index in pending if verdicts[index] is None]
+    if ask_model:
+        jobs_text = orjson.dumps(
+            [{"id": index + 1, "description": truncate_description(descriptions[index])} for index in ask_model]
+        ).decode("utf-8")
+        response = invoke_cached(
+            get_batch_llm(),
+            f"{_BATCH_PREFIX}{jobs_text}{_BATCH_SUFFIX}",
+            validate=lambda text: _parse_batch_response(text) is not None,
+        )
+
+        entries = _parse_batch_response(response)
+        if entries is None:
+            logger.warning("Could not parse batch analysis response: %.200s", response)
+            entries = []
+
+        for entry in entries:
+            try:
+                index = int(entry["id"]) - 1
+                sponsorship = str(entry["sponsorship"]).strip().lower()
+            except (KeyError, TypeError, ValueError):
+                continue
+            if index in verdicts and verdicts[index] is None:
+                verdicts[index] = "yes" if "yes" in sponsorship else "no"
+
+    # Jobs the model left out fall back to the per-job prompt, run concurrently (their LLM calls
+    # share _llm_request_slots with every other batch)
+    missing = [index for index in ask_model if verdicts[index] is None]
+    for missing_index, verdict in analyze_jobs_concurrently(
+        [descriptions[index] for index in missing], _detect_sponsorship
+    ):
+        verdicts[missing[missing_index]] = verdict
+
+    for index in pending:
+        results[index] = {
+            "sponsorship_available": verdicts[index],
+            "ats_keywords": cached_analyses[index].get("ats_keywords") or keywords[index],
+        }
+        _store_analysis(descriptions[index], results[index])
+
+    return results
+
+
+def analyze_jobs_concurrently(
+    jobs: Iterable[JobListing],
+    analyze: Callable[[JobListing], Any] = analyze_job_for_sponsorship_and_keywords,
+    max_workers: int = MAX_CONCURRENT_ANALYSES,
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Runs `analyze` on every job using a thread pool and yields (index, result) pairs
+    in completion order, so callers can report progress as each job finishes.
+    Total wall time is bounded by the slowest jobs rather than the sum of all of them.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(analyze, job): index for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # Drop queued work if the caller stops early (e.g. after an error)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def analyze_jobs_in_batches(
+    jobs: List[JobListing],
+    batch_size: int = ANALYSIS_BATCH_SIZE,
+    max_workers: int = MAX_CONCURRENT_ANALYSES,
+) -> Iterator[Tuple[int, dict]]:
+    """
+    Splits jobs into groups of `batch_size`, analyzes each group with analyze_jobs_batch
+    (groups run concurrently) and yields (index, analysis) pairs for every job in a group
+    as soon as that group's request returns.
+    All descriptions are prefetched up front, so later fetches overlap earlier LLM calls, and
+    are stored on the jobs as 'full_description'.
+    """
+    description_futures = prefetch_descriptions(jobs)
+    batches = [
+        (jobs[start:start + batch_size], description_futures[start:start + batch_size])
+        for start in range(0, len(jobs), batch_size)
+    ]
+
+    def analyze_batch(batch: Tuple[List[JobListing], List[Future]]) -> List[dict]:
+        batch_jobs, futures = batch
+        descriptions = [future.result() for future in futures]
+        # Kept on the jobs, so previews and "Show Full Job Details" need no second download
+        for job, description in zip(batch_jobs, descriptions):
+            store_full_description(job, description)
+        return analyze_jobs_batch(batch_jobs, descriptions)
+
+    try:
+        for batch_index, analyses in analyze_jobs_concurrently(
+            batches, analyze_batch, max_workers=max_workers
+        ):
+            for offset, analysis in enumerate(analyses):
+                yield batch_index * batch_size + offset, analysis
+    finally:
+        for future in description_futures:
+            future.cancel()
@@ -1,4 +1,4 @@
-from typing import TypedDict, List, Any, Optional
+from typing import TypedDict, Iterator, List, Any, Optional
 from linkedin_scraper import LinkedInJobScraper
 
 # Define a TypedDict for the job listing structure
@@ -11,11 +11,13 @@ class JobListing(TypedDict):
     salary: str
     jobUrl: str
     companyLogo: str
-    # New optional fields for job description preview and full description:
+    # Description preview (the results-page snippet, else the start of the full description once
+    # it is fetched; None while neither is known) and full description (None until fetched,
+    # "" when LinkedIn has none):
     description_preview: Optional[str]
     full_description: Optional[str]
 
-def perform_search(
+def iter_search_pages(
     keyword: str = "",
     location: str = "",
     date_posted: str = "",
@@ -26,10 +28,12 @@ def perform_search(
     sort_by: str = "",
     page: int = 0,
     limit: int = 0,
-) -> List[JobListing]:
+) -> Iterator[List[JobListing]]:
     """
-    Perform a LinkedIn job search with the given filters and return a list of JobListing objects.
-    Adds a 'description_preview' field and a 'full_description' field to each job for further processing.
+    Run a LinkedIn job search with the given filters and yield each results page's jobs as soon as
+    that page is parsed, so callers can process jobs while later pages are still being fetched.
+    Jobs carry the results-page snippet as 'description_preview' (None when LinkedIn has none);
+    'full_description' is not fetched.
     """
     # Initialize the scraper with provided filters
     scraper = LinkedInJobScraper(
@@ -44,25 +48,64 @@ def perform_search(
         page=page,
         limit=limit,
     )
-    # Fetch job listings
-    jobs_data = scraper.search_jobs()
-    # The scraper returns a list of dict; we ensure each is typed as JobListing for clarity
-    jobs: List[JobListing] = list(jobs_data)
-    
-    from job_analysis import fetch_full_job_description
-    
-    # For each job, add description preview and full description if not present
-    for job in jobs:
-        # Check if 'full_description' exists; if not, use an empty string
-        full_desc = job.get("full_description", "") or (fetch_full_job_description(job["jobUrl"]) or "")
-        # Optionally, if you have a method to fetch full description separately, call it here.
-        # For now, we assume the scraper either returns it or it remains empty.
-        job["full_description"] = full_desc or "Full description not available."
+    yield from scraper.iter_job_pages()
 
-        # Create a preview from the full description (e.g., first 200 characters)
-        if full_desc:
-            job["description_preview"] = f"{full_desc[:200]}..."
-        else:
-            job["description_preview"] = "No preview available."
+
+def perform_search(
+    keyword: str = "",
+    location: str = "",
+    date_posted: str = "",
+    job_type: str = "",
+    remote: str = "",
+    salary: str = "",
+    experience: str = "",
+    sort_by: str = "",
+    page: int = 0,
+    limit: int = 0,
+) -> List[JobListing]:
+    """
+    Perform a LinkedIn job search with the given filters and return a list of JobListing objects.
+    Jobs carry the results-page snippet as 'description_preview' when LinkedIn includes one.
+    Full descriptions cost one extra request per job, so 'full_description' stays None until
+    get_full_description or the sponsorship analysis fetches it (see store_full_description).
+    Fetching descriptions while later result pages load is left to callers of iter_search_pages
+    (the CLI pipeline); this function returns only after the last page.
+    """
+    jobs: List[JobListing] = []
+    for page_jobs in iter_search_pages(
+        keyword=keyword,
+        location=location,
+        date_posted=date_posted,
+        job_type=job_type,
+        remote=remote,
+        salary=salary,
+        experience=experience,
+        sort_by=sort_by,
+        page=page,
+        limit=limit,
+    ):
+        jobs.extend(page_jobs)
 
     return jobs
+
+
+def get_full_description(job: JobListing) -> str:
+    """
+    Return the job's full description, fetching (and remembering) it on first use.
+    Returns an empty string when LinkedIn has no description for the job.
+    """
+    if job.get("full_description") is None:
+        from job_analysis import fetch_full_job_description
+
+        store_full_description(job, fetch_full_job_description(job["jobUrl"]))
+    return job["full_description"]
+
+
+def store_full_description(job: JobListing, description: Optional[str]) -> None:
+    """
+    Remember a fetched full description on the job ("" when LinkedIn has none). Jobs without a
+    results-page snippet get the start of the description as their preview.
+    """
+    job["full_description"] = description or ""
+    if description and not job.get("description_preview"):
+        job["description_preview"] = f"{description[:200]}..."
@@ -1,8 +1,18 @@
-import requests
+import functools
+import logging
 import random
 import time
-from bs4 import BeautifulSoup
-from typing import List, Optional
+from itertools import chain
+from urllib.parse import quote_plus, urlencode
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+from typing import Dict, Iterator, List, Optional, Tuple
+from http_client import SERVER_ERROR_RETRY, create_session, load_proxies
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitError(Exception):
+    """LinkedIn answered a results page request with HTTP 429."""
 
 
 class LinkedInJobScraper:
@@ -45,6 +55,40 @@ class LinkedInJobScraper:
         "120000": "5",
     }
 
+    # Fields extracted from each job card. They are matched together with the <li> cards themselves
+    # by one grouped CSS selector, so each results page is walked once instead of 7 times per card.
+    CARD_FIELD_SELECTORS = {
+        "title": "h3.base-search-card__title",
+        "company": "h4.base-search-card__subtitle",
+        "location": "span.job-search-card__location",
+        "date": "time.job-search-card__listdate",
+        "salary": "span.job-search-card__salary-info",
+        "link": "a.base-card__full-link",
+        "logo": "img.artdeco-entity-image",
+        "snippet": "p.job-search-card__snippet",
+    }
+    CARD_SELECTOR = ", ".join(["li", *CARD_FIELD_SELECTORS.values()])
+    # (tag, class) -> field name, to tell which field a matched node belongs to
+    CARD_FIELD_KEYS = {
+        tuple(selector.split(".", 1)): field for field, selector in CARD_FIELD_SELECTORS.items()
+    }
+
+    # Adaptive politeness delay, tracked separately for every proxy (or the direct connection):
+    # it shrinks by 10% after each successful page and doubles after each rate limit (HTTP 429).
+    # A proxy that gets rate limited also sits out for PROXY_COOLDOWN seconds while other routes remain.
+    INITIAL_DELAY = 2.0
+    MIN_DELAY = 0.5
+    MAX_DELAY = 30.0
+    PROXY_COOLDOWN = 10 * 60
+
+    # Headers sent with every results page request; only the User-Agent changes per request
+    SEARCH_HEADERS = {
+        "Accept": "application/json, text/javascript, */*; q=0.01",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Referer": "https://www.linkedin.com/jobs",  # Referer set to jobs page
+        "X-Requested-With": "XMLHttpRequest",  # Indicate AJAX request
+    }
+
     # Some User-Agent strings to rotate for polite scraping
     USER_AGENTS = [
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
@@ -88,18 +132,55 @@ class LinkedInJobScraper:
         self.sort_by = sort_by.strip().lower()
         self.page = page if page is not None else 0
         self.limit = limit if limit is not None else 0
+        # One keep-alive session for every results page of this search. 429s are not retried by the
+        # adapter: the scraper reacts to them by slowing down and switching proxies.
+        self.session = create_session(cached=True, retry=SERVER_ERROR_RETRY)
+        # Outgoing routes: every proxy from LINKEDIN_PROXIES, or the direct connection (None)
+        self.proxies: List[Optional[str]] = load_proxies() or [None]
+        self._delay = {proxy: self.INITIAL_DELAY for proxy in self.proxies}
+        # Monotonic time before which each route must not be used again
+        self._next_request_at = {proxy: 0.0 for proxy in self.proxies}
 
-    def _build_search_url(self, start: int) -> str:
+    def _record_response(self, proxy: Optional[str], status_code: Optional[int]) -> None:
+        """
+        Adapt the delay of the route that just made a request and schedule its next allowed request.
+        Successful pages shrink the delay, rate limits double it, anything else keeps it unchanged.
+        A rate-limited proxy is also benched for PROXY_COOLDOWN, but only while another route is
+        still usable; the last usable route just waits out its (capped) delay, so a search never
+        stalls for the whole cooldown.
+        """
+        delay = self._delay[proxy]
+        if status_code == 200:
+            delay = max(self.MIN_DELAY, delay * 0.9)
+        elif status_code == 429:
+            delay = min(self.MAX_DELAY, delay * 2)
+        self._delay[proxy] = delay
+
+        now = time.monotonic()
+        wait = delay + random.random()  # jitter, so requests do not arrive at a fixed interval
+        if status_code == 429 and proxy is not None:
+            # Routes due within one maximum delay are usable; anything later is benched
+            other_route_usable = any(
+                self._next_request_at[other] <= now + self.MAX_DELAY + 1
+                for other in self.proxies
+                if other != proxy
+            )
+            if other_route_usable:
+                logger.warning("Proxy %s was rate limited, pausing it for %d seconds", proxy, self.PROXY_COOLDOWN)
+                wait = max(wait, self.PROXY_COOLDOWN)
+        self._next_request_at[proxy] = now + wait
+
+    @functools.cached_property
+    def _static_query(self) -> str:
         """
-        Construct the LinkedIn jobs search URL with query parameters for a given start offset.
-        The 'start' parameter is the index of the first job to fetch (multiples of 25).
+        Encoded query string for every search parameter except 'start', which is the only one
+        that changes from page to page. Built once per scraper.
         """
         params = {}
         if self.keyword:
-            # Replace spaces with '+' for the keywords (URL encoding will handle others)
-            params["keywords"] = self.keyword.replace(" ", "+")
+            params["keywords"] = self.keyword
         if self.location:
-            params["location"] = self.location.replace(" ", "+")
+            params["location"] = self.location
         if self.date_posted:
             # Map human-readable date filter to LinkedIn code (f_TPR)
             code = self.DATE_FILTERS.get(self.date_posted, "")
@@ -131,58 +212,71 @@ class LinkedInJobScraper:
                 params["sortBy"] = "DD"
             elif self.sort_by == "relevant":
                 params["sortBy"] = "R"
+        # Encode the query string (spaces become '+', reserved characters are escaped)
+        return urlencode(params, quote_via=quote_plus)
+
+    def _build_search_url(self, start: int) -> str:
+        """
+        Construct the LinkedIn jobs search URL for a given start offset.
+        The 'start' parameter is the index of the first job to fetch, counted from the starting page.
+        """
         # Set the start offset combining page offset and batch offset
-        params["start"] = start + (self.page * self.BATCH_SIZE)
-        # Build full URL with encoded query string
-        query_string = "&".join(
-            f"{key}={requests.utils.requote_uri(str(value))}"
-            for key, value in params.items()
-        )
-        return f"{self.BASE_URL}?{query_string}"
+        start = int(start + self.page * self.BATCH_SIZE)
+        if self._static_query:
+            return f"{self.BASE_URL}?{self._static_query}&start={start}"
+        return f"{self.BASE_URL}?start={start}"
 
-    def _parse_jobs_from_html(self, html: str) -> List[dict]:
+    def _parse_jobs_from_html(self, html: str) -> Tuple[List[dict], int]:
         """
         Parse the HTML fragment returned by LinkedIn and extract job listing data.
-        Returns a list of job dictionaries.
+        Returns a list of job dictionaries and the number of job cards on the page, including
+        cards skipped for missing a title or company (LinkedIn's 'start' offset counts those too).
         """
-        soup = BeautifulSoup(html, "html.parser")
-        job_elements = soup.find_all("li")  # Each job posting is in an <li> element
+        tree = LexborHTMLParser(html)
         jobs = []
-        for li in job_elements:
+        card_count = 0
+        for card in self._iter_job_cards(tree):
+            card_count += 1
             try:
-                title_elem = li.find("h3", class_="base-search-card__title")
-                company_elem = li.find("h4", class_="base-search-card__subtitle")
-                location_elem = li.find("span", class_="job-search-card__location")
-                date_elem = li.find("time", class_="job-search-card__listdate")
-                salary_elem = li.find("span", class_="job-search-card__salary-info")
-                link_elem = li.find("a", class_="base-card__full-link")
-                logo_elem = li.find("img", class_="artdeco-entity-image")
+                title_elem = card.get("title")
+                company_elem = card.get("company")
+                location_elem = card.get("location")
+                date_elem = card.get("date")
+                salary_elem = card.get("salary")
+                link_elem = card.get("link")
+                logo_elem = card.get("logo")
+                snippet_elem = card.get("snippet")
 
-                position = title_elem.get_text(strip=True) if title_elem else None
-                company = company_elem.get_text(strip=True) if company_elem else None
-                location = location_elem.get_text(strip=True) if location_elem else None
+                position = title_elem.text(strip=True) if title_elem else None
+                company = company_elem.text(strip=True) if company_elem else None
+                location = location_elem.text(strip=True) if location_elem else None
                 date = (
-                    date_elem["datetime"] if date_elem else None
+                    date_elem.attributes["datetime"] if date_elem else None
                 )  # ISO date from datetime attribute
                 ago_time = (
-                    date_elem.get_text(strip=True) if date_elem else None
+                    date_elem.text(strip=True) if date_elem else None
                 )  # e.g., "3 weeks ago"
                 salary = None
                 if salary_elem:
-                    salary_text = salary_elem.get_text(
-                        " ", strip=True
+                    salary_text = salary_elem.text(
+                        separator=" ", strip=True
                     )  # get salary with spaces normalized
                     salary = salary_text if salary_text else None
-                job_url = link_elem["href"] if link_elem else None
+                job_url = link_elem.attributes["href"] if link_elem else None
                 # LinkedIn may provide a company logo image URL (often in data-delayed-url attribute)
                 company_logo = None
                 if logo_elem:
                     # data-delayed-url holds the actual image src if lazy-loaded
-                    company_logo = logo_elem.get("data-delayed-url") or logo_elem.get(
-                        "src"
-                    )
+                    company_logo = logo_elem.attributes.get(
+                        "data-delayed-url"
+                    ) or logo_elem.attributes.get("src")
+
+                # Short description excerpt some result pages include, used as a preview without
+                # fetching the job's detail page
+                snippet = " ".join(snippet_elem.text().split()) if snippet_elem else None
 
-                # Only include the job if it has at least title and company
+                # Only include the job if it has at least title and company.
+                # Every JobListing key is present; full_description stays None until it is fetched.
                 if position and company:
                     jobs.append(
                         {
@@ -194,12 +288,50 @@ class LinkedInJobScraper:
                             "salary": salary or "Not specified",
                             "jobUrl": job_url or "",
                             "companyLogo": company_logo or "",
+                            "description_preview": snippet or None,
+                            "full_description": None,
                         }
                     )
             except Exception as e:
                 # If a parsing error occurs for a job element, skip it
                 continue
-        return jobs
+        return jobs, card_count
+
+    def _iter_job_cards(self, tree: LexborHTMLParser) -> Iterator[Dict[str, LexborNode]]:
+        """
+        Walk the page once with CARD_SELECTOR and yield, for each top-level <li> job card, a dict
+        mapping field names to the first matching node inside that card. Matches come back in
+        document order, so every field node belongs to the most recent top-level <li>; lists nested
+        inside a card (e.g. "Actively hiring" badges) do not start a new card.
+        """
+        card = None
+        card_node = None
+        for node in tree.css(self.CARD_SELECTOR):
+            if node.tag == "li" and not (card_node is not None and self._is_inside(node, card_node)):
+                if card is not None:
+                    yield card
+                card = {}
+                card_node = node
+            elif card is not None:
+                for css_class in (node.attributes.get("class") or "").split():
+                    field = self.CARD_FIELD_KEYS.get((node.tag, css_class))
+                    if field:
+                        card.setdefault(field, node)
+                        break
+        if card is not None:
+            yield card
+
+    @staticmethod
+    def _is_inside(node: LexborNode, ancestor: LexborNode) -> bool:
+        """
+        Whether `node` is a descendant of `ancestor`.
+        """
+        parent = node.parent
+        while parent is not None:
+            if parent.mem_id == ancestor.mem_id:
+                return True
+            parent = parent.parent
+        return False
 
     def search_jobs(self) -> List[dict]:
         """
@@ -207,57 +339,84 @@ class LinkedInJobScraper:
         until the specified limit is reached or no more jobs are found.
         Returns a list of job listings (each as a dict).
         """
-        results: List[dict] = []
+        return list(chain.from_iterable(self.iter_job_pages()))
+
+    def iter_job_pages(self) -> Iterator[List[dict]]:
+        """
+        Fetch result pages one by one and yield each page's job listings as soon as it is parsed,
+        so callers can start working on a page (e.g. fetching its descriptions) while the next
+        page waits out the politeness delay. Stops once the limit is reached or no more jobs are found.
+        """
+        job_count = 0
         start_offset = 0
         consecutive_errors = 0
-        max_errors = (
-            3  # stop if 3 consecutive errors (to avoid infinite loop in case of issues)
-        )
+        # Stop after 3 consecutive errors (to avoid infinite loop in case of issues),
+        # plus one more attempt for every extra proxy that could still get through
+        max_errors = 3 + len(self.proxies) - 1
 
         while True:
+            # Use the route that may be used again soonest, and wait only for what is left of its
+            # delay, since the time spent parsing the previous page already counts towards it
+            proxy = min(self.proxies, key=self._next_request_at.__getitem__)
+            remaining_delay = self._next_request_at[proxy] - time.monotonic()
+            if remaining_delay > 0:
+                time.sleep(remaining_delay)
             # Build URL for current batch
             url = self._build_search_url(start_offset)
             # Prepare headers (random User-Agent for each batch request)
-            headers = {
-                "User-Agent": random.choice(self.USER_AGENTS),
-                "Accept": "application/json, text/javascript, */*; q=0.01",
-                "Accept-Language": "en-US,en;q=0.9",
-                "Referer": "https://www.linkedin.com/jobs",  # Referer set to jobs page
-                "X-Requested-With": "XMLHttpRequest",  # Indicate AJAX request
-            }
+            headers = {**self.SEARCH_HEADERS, "User-Agent": random.choice(self.USER_AGENTS)}
+            status_code = None
             try:
-                resp = requests.get(url, headers=headers, timeout=10)
+                resp = self.session.get(
+                    url,
+                    headers=headers,
+                    proxies={"http": proxy, "https": proxy} if proxy else None,
+                    timeout=10,
+                )
+                status_code = resp.status_code
+                if not getattr(resp, "from_cache", False):
+                    # Only real requests count towards the politeness delay; cached pages are free
+                    self._record_response(proxy, resp.status_code)
                 # LinkedIn returns HTTP 200 with an HTML snippet for valid queries.
                 # If status is not 200, or content is empty, we consider it an error.
                 if resp.status_code != 200 or not resp.text:
                     # If we hit a rate limit (429) or any error status, handle accordingly
                     if resp.status_code == 429:
-                        raise Exception("Rate limit reached (HTTP 429)")
+                        raise RateLimitError("Rate limit reached (HTTP 429)")
                     raise Exception(f"Request failed with status {resp.status_code}")
                 # Parse jobs from the returned HTML content
-                batch_jobs = self._parse_jobs_from_html(resp.text)
-                if not batch_jobs:
-                    # No jobs returned – end of results
-                    break
-                results.extend(batch_jobs)
-                # If a limit is set and we've reached or exceeded it, truncate and stop
-                if self.limit and len(results) >= self.limit:
-                    results = results[: self.limit]
-                    break
-                # Prepare for next batch
-                start_offset += self.BATCH_SIZE
-                consecutive_errors = 0  # reset error counter on success
-                # Pause between requests to avoid overwhelming the server (politeness delay)
-                time.sleep(2 + random.random())  # 2 to 3 seconds delay
+                batch_jobs, card_count = self._parse_jobs_from_html(resp.text)
             except Exception as err:
                 consecutive_errors += 1
-                print(f"Error fetching jobs at offset {start_offset}: {err}")
+                logger.warning("Error fetching jobs at offset %d: %s", start_offset, err)
                 if consecutive_errors >= max_errors:
-                    print(
-                        "Maximum consecutive errors reached. Stopping further requests."
-                    )
+                    logger.error("Maximum consecutive errors reached. Stopping further requests.")
                     break
+                if isinstance(err, RateLimitError):
+                    # The adaptive delay (and proxy cooldown) already decides when to try again
+                    continue
+                if status_code is None:
+                    # No response at all (connection error, timeout): still space out the retry
+                    self._record_response(proxy, None)
                 # Exponential backoff before retrying the batch that failed
                 time.sleep((2**consecutive_errors) * 1)  # 2s, 4s, 8s...
                 # (Loop will retry the same offset without incrementing it)
-        return results
+                continue
+
+            if not card_count:
+                # No jobs returned – end of results
+                break
+            # LinkedIn sometimes returns fewer than BATCH_SIZE jobs per page, so the next page
+            # starts right after the cards actually received (skipped ones included)
+            next_offset = start_offset + card_count
+            # If a limit is set, truncate the page that reaches it and stop after yielding it
+            if self.limit:
+                batch_jobs = batch_jobs[: self.limit - job_count]
+            job_count += len(batch_jobs)
+            if batch_jobs:
+                yield batch_jobs
+            if self.limit and job_count >= self.limit:
+                break
+            # Prepare for next batch
+            start_offset = next_offset
+            consecutive_errors = 0  # reset error counter on success
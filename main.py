@@ -1,5 +1,13 @@
-from job_search_core import perform_search, JobListing
-from job_analysis import analyze_job_for_sponsorship
+import logging
+import queue
+import threading
+from job_search_core import iter_search_pages, JobListing
+from job_analysis import analyze_job_for_sponsorship, MAX_CONCURRENT_ANALYSES
+
+logger = logging.getLogger(__name__)
+
+# Jobs waiting between pipeline stages; bounded so a large limit cannot pile up unanalyzed jobs
+PIPELINE_QUEUE_SIZE = 50
 
 
 def prompt_user_for_filters() -> dict:
@@ -50,56 +58,109 @@ def prompt_user_for_filters() -> dict:
     }
 
 
+def produce_jobs(search_filters: dict, job_queue: queue.Queue, consumer_count: int) -> None:
+    """
+    Scraper stage: put every job on the queue as soon as its results page is parsed,
+    then one None sentinel per analyzer thread. A failed search is logged and ends the stream early,
+    so jobs already queued are still analyzed and printed.
+    """
+    try:
+        for page_jobs in iter_search_pages(**search_filters):
+            for job in page_jobs:
+                job_queue.put(job)
+    except Exception:
+        logger.exception("Job search failed")
+    finally:
+        for _ in range(consumer_count):
+            job_queue.put(None)
+
+
+def analyze_jobs(job_queue: queue.Queue, result_queue: queue.Queue, need_sponsorship: bool) -> None:
+    """
+    Analyzer stage: take jobs off the queue until the sentinel, check visa sponsorship when it is
+    required and pass each job on as (job, keep) where keep tells whether it matches. Signals the
+    printer with a None sentinel when done.
+    """
+    try:
+        while (job := job_queue.get()) is not None:
+            if not need_sponsorship:
+                # No visa analysis required
+                job["visa_sponsorship"] = "N/A"
+                result_queue.put((job, True))
+                continue
+            try:
+                sponsorship_available = analyze_job_for_sponsorship(job)
+            except Exception as err:
+                logger.warning("Error analyzing job %s: %s", job["jobUrl"], err)
+                sponsorship_available = "no"
+            job["visa_sponsorship"] = "Yes" if sponsorship_available == "yes" else "No"
+            result_queue.put((job, sponsorship_available == "yes"))
+    finally:
+        result_queue.put(None)
+
+
+def print_job(job: JobListing, need_sponsorship: bool) -> None:
+    print(f"Title: {job['position']}")
+    print(f"Company: {job['company']}  |  Location: {job['location']}")
+    print(f"Posted: {job['agoTime']}  |  URL: {job['jobUrl']}")
+
+    if need_sponsorship:
+        print(f"Visa Sponsorship Available?: {job['visa_sponsorship']}")
+
+    print("-" * 60)
+
+
 def main():
+    # Warnings and errors from the scraper and analysis are shown; per-request debug output is not
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    # The OpenAI client logs every HTTP request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
     filters = prompt_user_for_filters()
+    need_sponsorship = filters.pop("need_sponsorship")
     print("\nSearching LinkedIn for jobs...\n")
 
-    jobs = perform_search(
-        keyword=filters["keyword"],
-        location=filters["location"],
-        date_posted=filters["date_posted"],
-        job_type=filters["job_type"],
-        remote=filters["remote"],
-        experience=filters["experience"],
-        salary=filters["salary"],
-        limit=filters["limit"],
-        page=filters["page"],
-        sort_by=filters["sort_by"],
-    )
-
-    if not jobs:
+    # Three stages connected by queues: the scraper produces jobs page by page, analyzer threads
+    # check them while later pages are still loading, and this thread prints each match as soon
+    # as it is analyzed (in completion order).
+    analyzer_count = MAX_CONCURRENT_ANALYSES if need_sponsorship else 1
+    job_queue: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    result_queue: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    threads = [
+        threading.Thread(target=produce_jobs, args=(filters, job_queue, analyzer_count), daemon=True),
+        *(
+            threading.Thread(target=analyze_jobs, args=(job_queue, result_queue, need_sponsorship), daemon=True)
+            for _ in range(analyzer_count)
+        ),
+    ]
+    for thread in threads:
+        thread.start()
+
+    total_jobs = 0
+    matched_jobs = 0
+    finished_analyzers = 0
+    while finished_analyzers < analyzer_count:
+        result = result_queue.get()
+        if result is None:
+            finished_analyzers += 1
+            continue
+        job, keep = result
+        total_jobs += 1
+        if not keep:
+            continue
+        if matched_jobs == 0:
+            print("Results:\n" + "-" * 60)
+        matched_jobs += 1
+        print_job(job, need_sponsorship)
+
+    if not total_jobs:
         print("No jobs found for the given criteria.")
         return
 
-    filtered_jobs = []
-
-    for job in jobs:
-        if filters["need_sponsorship"]:
-            sponsorship_available = analyze_job_for_sponsorship(job)
-            if sponsorship_available == "yes":
-                job["visa_sponsorship"] = "Yes"
-                filtered_jobs.append(job)
-        else:
-            # No visa analysis required
-            job["visa_sponsorship"] = "N/A"
-            filtered_jobs.append(job)
-
-    if not filtered_jobs:
+    if not matched_jobs:
         print("No jobs found that offer visa sponsorship based on your criteria.")
         return
 
-    print(f"\nFound {len(filtered_jobs)} job(s).")
-    print("Results:\n" + "-" * 60)
-
-    for job in filtered_jobs:
-        print(f"Title: {job['position']}")
-        print(f"Company: {job['company']}  |  Location: {job['location']}")
-        print(f"Posted: {job['agoTime']}  |  URL: {job['jobUrl']}")
-
-        if filters["need_sponsorship"]:
-            print(f"Visa Sponsorship Available?: {job['visa_sponsorship']}")
-
-        print("-" * 60)
+    print(f"\nFound {matched_jobs} job(s).")
 
 
 if __name__ == "__main__":